@@ -1,10 +1,35 @@
 
-from i2_slack_modules.common import ts_to_date, parse_relative_date, my_own_function_name
+from i2_slack_modules.common import ts_to_date, parse_relative_date, my_own_function_name, confirmation_answer_regex
 from i2_slack_modules.slack_helper import *
 from i2_slack_modules.icinga_connection import *
 from datetime import datetime
 
 
+def get_keyword_positions(word_list=None, keywords=None):
+    """
+    Find the first position of each keyword in a list of words in a single pass
+
+    Parameters
+    ----------
+    word_list : list
+        list of words to search in, case is ignored
+    keywords : list, tuple
+        lowercase keywords to search for
+
+    Returns
+    -------
+    dict: keywords found with index of their first occurrence
+    """
+
+    positions = dict()
+    for index, word in enumerate(word_list):
+        word = word.lower()
+        if word in keywords and word not in positions:
+            positions[word] = index
+
+    return positions
+
+
 # noinspection PyUnusedLocal
 def chat_with_user(
         config=None,
@@ -112,14 +137,14 @@ def chat_with_user(
 
     # check or command
     if conversation.command is None:
-        logging.debug("Command not set, parsing: %s" % slack_message)
+        logging.debug("Command not set, parsing: %s", slack_message)
         conversation.command = bot_commands.get_command_called(slack_message)
 
         if conversation.command.name not in action_commands.keys():
             conversation.command = None
             return None
 
-        logging.debug("Command parsed: %s" % conversation.command.name)
+        logging.debug("Command parsed: %s", conversation.command.name)
 
         slack_message = conversation.command.strip_command(slack_message)
 
@@ -140,7 +165,7 @@ def chat_with_user(
 
         if len(slack_message) != 0:
             # we got a filter
-            logging.debug("Sub command not set, parsing: %s" % slack_message)
+            logging.debug("Sub command not set, parsing: %s", slack_message)
 
             if conversation.command.has_sub_commands():
                 conversation.sub_command = \
@@ -148,20 +173,22 @@ def chat_with_user(
 
                 if conversation.sub_command:
                     slack_message = conversation.sub_command.strip_command(slack_message)
-                    logging.debug("Sub command parsed: %s" % conversation.sub_command.name)
+                    logging.debug("Sub command parsed: %s", conversation.sub_command.name)
 
     # check for filter
     if conversation.filter is None:
         if len(quoted_split(string_to_split=slack_message)) != 0:
             # we got a filter
-            logging.debug("Filter not set, parsing: %s" % slack_message)
+            logging.debug("Filter not set, parsing: %s", slack_message)
 
             split_slack_message = quoted_split(string_to_split=slack_message, preserve_quotations=True)
 
-            #  everything left of the index string will be parsed as filter
-            if filter_end_marker is not None and filter_end_marker in [s.lower() for s in split_slack_message]:
+            index = None
+            if filter_end_marker is not None:
+                index = get_keyword_positions(split_slack_message, (filter_end_marker,)).get(filter_end_marker)
 
-                index = [s.lower() for s in split_slack_message].index(filter_end_marker)
+            #  everything left of the index string will be parsed as filter
+            if index is not None:
 
                 # get end of filter list
                 filter_list = split_slack_message[0:index]
@@ -181,7 +208,7 @@ def chat_with_user(
 
             filter_list = slack_user.get_last_user_filter_if_requested(filter_list)
 
-            logging.debug("Filter parsed: %s" % filter_list)
+            logging.debug("Filter parsed: %s", filter_list)
 
             if len(filter_list) > 0:
                 conversation.filter = filter_list
@@ -197,9 +224,19 @@ def chat_with_user(
 
         host_filter = list()
         service_filter = list()
+        acknowledged = None
         if conversation.command.name == "acknowledge":
+            # only problems which are not acknowledged can be acknowledged
             host_filter = ["host.state != 0"]
             service_filter = ["service.state != 0"]
+            acknowledged = False
+
+        # filter comments by entry type (1: comment, 4: acknowledgement)
+        if conversation.sub_command is not None:
+            if conversation.sub_command.name == "comment":
+                host_filter = service_filter = ["comment.entry_type == 1"]
+            elif conversation.sub_command.name == "acknowledgement":
+                host_filter = service_filter = ["comment.entry_type == 4"]
 
         # query hosts and services
         if len(conversation.filter) == 1:
@@ -211,7 +248,7 @@ def chat_with_user(
                 else:
                     object_type = "HostComment"
 
-            i2_result = get_i2_object(config, object_type, host_filter, conversation.filter)
+            i2_result = get_i2_object(config, object_type, host_filter, conversation.filter, acknowledged)
 
             if i2_result.error is None and len(i2_result.data) == 0:
                 object_type = "Service"
@@ -221,7 +258,7 @@ def chat_with_user(
                     else:
                         object_type = "ServiceComment"
 
-                i2_result = get_i2_object(config, object_type, service_filter, conversation.filter)
+                i2_result = get_i2_object(config, object_type, service_filter, conversation.filter, acknowledged)
 
         # just query services
         else:
@@ -232,11 +269,11 @@ def chat_with_user(
                 else:
                     object_type = "ServiceComment"
 
-            i2_result = get_i2_object(config, object_type, service_filter, conversation.filter)
+            i2_result = get_i2_object(config, object_type, service_filter, conversation.filter, acknowledged)
 
         # encountered Icinga request issue
         if i2_result.error:
-            logging.debug("No icinga objects found for filter: %s" % conversation.filter)
+            logging.debug("No icinga objects found for filter: %s", conversation.filter)
 
             return slack_error_response(
                 header="Icinga request error while trying to find matching hosts/services",
@@ -244,37 +281,8 @@ def chat_with_user(
                 error_message=i2_result.error
             )
 
-        # we can set a downtime for all objects no matter their state
-        if conversation.sub_command is not None:
-
-            if conversation.sub_command.name == "downtime" and len(i2_result.data) > 0:
-                conversation.filter_result = i2_result.data
-            else:
-                # filter results based on sub command name
-                ack_filter_result = list()
-                for result in i2_result.data:
-                    if conversation.sub_command.name == "comment" and result.get("entry_type") == 1:
-                        ack_filter_result.append(result)
-                    if conversation.sub_command.name == "acknowledgement" and result.get("entry_type") == 4:
-                        ack_filter_result.append(result)
-
-                if len(ack_filter_result) > 0:
-                    conversation.filter_result = ack_filter_result
-
-        elif conversation.command.name == "acknowledge" and len(i2_result.data) > 0:
-
-            # only objects which are not acknowledged can be acknowledged
-            ack_filter_result = list()
-            for result in i2_result.data:
-                # only add results which are not acknowledged
-                if result.get("acknowledgement") == 0:
-                    ack_filter_result.append(result)
-
-            if len(ack_filter_result) > 0:
-                conversation.filter_result = ack_filter_result
-
-        else:
-            conversation.filter_result = i2_result.data
+        # results are already filtered by Icinga2
+        conversation.filter_result = i2_result.data
 
         # save current conversation state if filter returned any objects
         if conversation.filter_result and len(conversation.filter_result) > 0:
@@ -282,8 +290,8 @@ def chat_with_user(
             if conversation.sub_command is not None:
                 sub_command_name = f" {conversation.sub_command.name}"
 
-            logging.debug("Found %d objects for command %s%s" %
-                          (len(conversation.filter_result), conversation.command.name, sub_command_name))
+            logging.debug("Found %d objects for command %s%s",
+                          len(conversation.filter_result), conversation.command.name, sub_command_name)
 
             conversation.object_type = object_type
         else:
@@ -294,19 +302,16 @@ def chat_with_user(
 
         if len(cma) != 0:
 
-            logging.debug("Start date not set, parsing: %s" % " ".join(cma))
-
             date_string_parse = " ".join(cma)
 
-            cma_lower = [s.lower() for s in cma]
+            logging.debug("Start date not set, parsing: %s", date_string_parse)
 
-            from_index = None
-            until_index = None
-            if "from" in cma_lower:
-                from_index = cma_lower.index("from")
+            keyword_positions = get_keyword_positions(cma, ("from", "until"))
 
-                if "until" in cma_lower:
-                    until_index = cma_lower.index("until")
+            from_index = keyword_positions.get("from")
+            until_index = None
+            if from_index is not None:
+                until_index = keyword_positions.get("until")
 
             if from_index is not None and len(cma) > from_index + 1:
                 cma = cma[from_index + 1:]
@@ -336,13 +341,10 @@ def chat_with_user(
 
         if len(cma) != 0:
 
-            logging.debug("End date not set, parsing: %s" % " ".join(cma))
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug("End date not set, parsing: %s", " ".join(cma))
 
-            cma_lower = [s.lower() for s in cma]
-
-            until_index = None
-            if "until" in cma_lower:
-                until_index = cma_lower.index("until")
+            until_index = get_keyword_positions(cma, ("until",)).get("until")
 
             if until_index is not None and len(cma) > until_index + 1:
                 cma = cma[until_index + 1:]
@@ -370,9 +372,9 @@ def chat_with_user(
     if need_comment is True and conversation.description is None and conversation.filter_result is not None:
 
         if len(cma) != 0 and len("".join(cma).strip()) != 0:
-            logging.debug("Description not set, parsing: %s" % " ".join(cma))
-
             conversation.description = " ".join(cma)
+
+            logging.debug("Description not set, parsing: %s", conversation.description)
             cma = list()
 
     # ask for sub command
@@ -490,9 +492,10 @@ def chat_with_user(
     if not conversation.confirmed:
 
         if conversation.confirmation_sent:
-            if cma[0].startswith("y") or cma[0].startswith("Y"):
+            confirmation_answer = confirmation_answer_regex.match(cma[0] if len(cma) > 0 else "")
+            if confirmation_answer and confirmation_answer.group("yes"):
                 conversation.confirmed = True
-            elif cma[0].startswith("n") or cma[0].startswith("N"):
+            elif confirmation_answer and confirmation_answer.group("no"):
                 conversation.canceled = True
             else:
                 # see if user tried to filter the selection (i.e.: 1,2)
@@ -527,17 +530,19 @@ def chat_with_user(
                 "Command": command,
                 "Type": confirmation_type
             }
+            end_date_text = None
+            if need_end_date is True:
+                end_date_text = "Never" if conversation.end_date == -1 else ts_to_date(conversation.end_date)
+
             if need_start_date is True:
                 confirmation["Start"] = ts_to_date(conversation.start_date)
-                confirmation["End"] = ts_to_date(conversation.end_date)
+                confirmation["End"] = end_date_text
 
             elif conversation.command.name == "acknowledge":
-                confirmation["Expire"] = "Never" if conversation.end_date == -1 else ts_to_date(
-                    conversation.end_date)
+                confirmation["Expire"] = end_date_text
 
             elif conversation.command.name == "delay notification":
-                confirmation["Delayed until"] = "Never" if conversation.end_date == -1 else ts_to_date(
-                    conversation.end_date)
+                confirmation["Delayed until"] = end_date_text
 
             if need_comment is True:
                 confirmation["Comment"] = conversation.description
@@ -626,15 +631,21 @@ def chat_with_user(
 
             return slack_error_response(header="Icinga request error", error_message=error_message)
 
-        # define filters
+        # define filters, use one "in" expression per host instead of one expression per object
         filter_list = list()
         if conversation.object_type == "Host":
-            for i2_object in conversation.filter_result:
-                filter_list.append('host.name=="%s"' % i2_object.get("name"))
+            filter_list.append('host.name in [%s]' %
+                               ", ".join(['"%s"' % i2_object.get("name") for i2_object in conversation.filter_result]))
         else:
+            services_per_host = dict()
             for i2_object in conversation.filter_result:
-                filter_list.append('( host.name=="%s" && service.name=="%s" )' %
-                                   (i2_object.get("host_name"), i2_object.get("name")))
+                services_per_host.setdefault(i2_object.get("host_name"), list()).append(i2_object.get("name"))
+
+            for host_name, service_names in services_per_host.items():
+                filter_list.append('( host.name=="%s" && service.name in [%s] )' %
+                                   (host_name, ", ".join(['"%s"' % x for x in service_names])))
+
+        num_objects = len(conversation.filter_result)
 
         success_message = None
         i2_error = None
@@ -671,7 +682,7 @@ def chat_with_user(
                 logging.debug("Sending Acknowledgement to Icinga2")
 
                 success_message = "Successfully acknowledged %s problem%s!" % \
-                                  (conversation.object_type, plural(len(filter_list)))
+                                  (conversation.object_type, plural(num_objects))
 
                 i2_response = i2_handle.actions.acknowledge_problem(
                     object_type=conversation.object_type,
@@ -686,7 +697,7 @@ def chat_with_user(
                 logging.debug("Sending Comment to Icinga2")
 
                 success_message = "Successfully added %s comment%s!" % \
-                                  (conversation.object_type, plural(len(filter_list)))
+                                  (conversation.object_type, plural(num_objects))
 
                 i2_response = i2_handle.actions.add_comment(
                     object_type=conversation.object_type,
@@ -699,7 +710,7 @@ def chat_with_user(
                 logging.debug("Sending reschedule check to Icinga2")
 
                 success_message = "Successfully rescheduled %s check%s!" % \
-                                  (conversation.object_type, plural(len(filter_list)))
+                                  (conversation.object_type, plural(num_objects))
 
                 i2_response = i2_handle.actions.reschedule_check(
                     object_type=conversation.object_type,
@@ -710,7 +721,7 @@ def chat_with_user(
                 logging.debug("Sending custom notification to Icinga2")
 
                 success_message = "Successfully sent %s notification%s!" % \
-                                  (conversation.object_type, plural(len(filter_list)))
+                                  (conversation.object_type, plural(num_objects))
 
                 i2_response = i2_handle.actions.send_custom_notification(
                     object_type=conversation.object_type,
@@ -723,7 +734,7 @@ def chat_with_user(
                 logging.debug("Sending delay notification to Icinga2")
 
                 success_message = "Successfully delayed %s notification%s!" % \
-                                  (conversation.object_type, plural(len(filter_list)))
+                                  (conversation.object_type, plural(num_objects))
 
                 i2_response = i2_handle.actions.delay_notification(
                     object_type=conversation.object_type,
@@ -732,7 +743,7 @@ def chat_with_user(
                 )
             elif conversation.command.name == "remove":
 
-                logging.debug(f"Sending remove {conversation.sub_command.name} to Icinga2")
+                logging.debug("Sending remove %s to Icinga2", conversation.sub_command.name)
 
                 success_message = f"Successfully removed {conversation.sub_command.name}!"
 
@@ -780,6 +791,9 @@ def chat_with_user(
             logging.error("Unable to perform Icinga2 action: %s" % i2_error)
             pass
 
+        # objects might have changed, don't answer following commands from cache
+        clear_i2_cache()
+
         if i2_error:
             return slack_error_response(header="Icinga request error", error_message=i2_error)
 
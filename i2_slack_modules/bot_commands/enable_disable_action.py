@@ -1,5 +1,5 @@
 
-from i2_slack_modules.common import my_own_function_name
+from i2_slack_modules.common import my_own_function_name, confirmation_answer_regex
 from i2_slack_modules.slack_helper import BotResponse, slack_error_response
 from i2_slack_modules.icinga_connection import *
 
@@ -156,9 +156,10 @@ def enable_disable_action(
     if not this_conversation.confirmed:
 
         if this_conversation.confirmation_sent:
-            if slack_message.startswith("y") or slack_message.startswith("Y"):
+            confirmation_answer = confirmation_answer_regex.match(slack_message)
+            if confirmation_answer and confirmation_answer.group("yes"):
                 this_conversation.confirmed = True
-            elif slack_message.startswith("n") or slack_message.startswith("N"):
+            elif confirmation_answer and confirmation_answer.group("no"):
                 this_conversation.canceled = True
             else:
                 this_conversation.confirmation_sent = False
@@ -271,6 +272,9 @@ def enable_disable_action(
             logging.error("Unable to perform Icinga2 object update: %s" % i2_error)
             pass
 
+        # objects might have changed, don't answer following commands from cache
+        clear_i2_cache()
+
         if i2_error:
             return slack_error_response(header="Icinga request error", error_message=i2_error)
 
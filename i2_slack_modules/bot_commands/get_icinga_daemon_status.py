@@ -1,8 +1,8 @@
 
 from i2_slack_modules import enabled_disabled
 from i2_slack_modules.common import ts_to_date
-from i2_slack_modules.slack_helper import BotResponse
-from i2_slack_modules.icinga_connection import get_i2_status
+from i2_slack_modules.slack_helper import BotResponse, add_stale_data_warning
+from i2_slack_modules.icinga_connection import get_i2_status, i2_request_executor
 
 
 # noinspection PyTypeChecker
@@ -25,8 +25,6 @@ def get_icinga_daemon_status(config=None, startup=False, *args, **kwargs):
     BotResponse: questions about the action, confirmations or errors
     """
 
-    i2_status = get_i2_status(config, "")
-
     icingaapplication = {
         "component_name": "IcingaApplication",
         "data": None
@@ -36,8 +34,18 @@ def get_icinga_daemon_status(config=None, startup=False, *args, **kwargs):
         "data": None
     }
 
+    # request only the two components needed instead of the status of all components
+    i2_status_futures = [
+        i2_request_executor.submit(get_i2_status, config, component["component_name"], allow_stale=True)
+        for component in [icingaapplication, apilistener]
+    ]
+    i2_status_list = [i2_status_future.result() for i2_status_future in i2_status_futures]
+
+    # report the first error if any request failed
+    i2_status = next((x for x in i2_status_list if x.error), i2_status_list[0])
+
     if not i2_status.error:
-        for component in i2_status.data.get("results"):
+        for component in [result for x in i2_status_list for result in x.data.get("results")]:
 
             if component["name"] == apilistener["component_name"]:
                 apilistener["data"] = component["status"]["api"]
@@ -121,4 +129,7 @@ def get_icinga_daemon_status(config=None, startup=False, *args, **kwargs):
         }
     )
 
+    if not i2_status.error and any(x.stale for x in i2_status_list):
+        add_stale_data_warning(status_reply)
+
     return status_reply
@@ -21,7 +21,7 @@ def get_icinga_status_overview(config=None, *args, **kwargs):
 
     response = BotResponse(text="Status Overview")
 
-    i2_status = get_i2_status(config, "CIB")
+    i2_status = get_i2_status(config, "CIB", allow_stale=True)
 
     if i2_status.error:
         return slack_error_response(header="Icinga request error", error_message=i2_status.error)
@@ -56,10 +56,11 @@ def get_icinga_status_overview(config=None, *args, **kwargs):
     }
 
     # add block text with number of unhandled problems
-    problems_unhandled = host_count["UNHANDLED"] + service_count["UNHANDLED"]
-    response.add_block("*Found %s unhandled problem%s*" %
-                       ("no" if problems_unhandled == 0 else
-                        str(problems_unhandled), plural(problems_unhandled)))
+    hosts_unhandled = host_count["UNHANDLED"]
+    services_unhandled = service_count["UNHANDLED"]
+    problems_unhandled = hosts_unhandled + services_unhandled
+    response.add_block(f"*Found {'no' if problems_unhandled == 0 else problems_unhandled} "
+                       f"unhandled problem{plural(problems_unhandled)}*")
 
     # compile answer for host objects
     host_fields = list()
@@ -72,16 +73,12 @@ def get_icinga_status_overview(config=None, *args, **kwargs):
             "short": True
         })
 
-    response.add_attachment(
-        {
-            "fallback": "Host status",
-            "text": "*%s unhandled host%s*" %
-                    ("No" if host_count["UNHANDLED"] == 0 else
-                     str(host_count["UNHANDLED"]), plural(host_count["UNHANDLED"])),
-            "color": "%s" % "good" if host_count["UNHANDLED"] == 0 else "danger",
-            "fields": host_fields
-        }
-    )
+    host_attachment = {
+        "fallback": "Host status",
+        "text": f"*{'No' if hosts_unhandled == 0 else hosts_unhandled} unhandled host{plural(hosts_unhandled)}*",
+        "color": "%s" % "good" if hosts_unhandled == 0 else "danger",
+        "fields": host_fields
+    }
 
     # compile answer for service objects
     service_fields = list()
@@ -94,15 +91,17 @@ def get_icinga_status_overview(config=None, *args, **kwargs):
             "short": True
         })
 
-    response.add_attachment(
-        {
-            "fallback": "Service status",
-            "text": "*%s unhandled service%s*" %
-                    ("No" if service_count["UNHANDLED"] == 0 else
-                     str(service_count["UNHANDLED"]), plural(service_count["UNHANDLED"])),
-            "color": "%s" % "good" if service_count["UNHANDLED"] == 0 else "danger",
-            "fields": service_fields
-        }
-    )
+    service_attachment = {
+        "fallback": "Service status",
+        "text": f"*{'No' if services_unhandled == 0 else services_unhandled} "
+                f"unhandled service{plural(services_unhandled)}*",
+        "color": "%s" % "good" if services_unhandled == 0 else "danger",
+        "fields": service_fields
+    }
+
+    response.add_attachment([host_attachment, service_attachment])
+
+    if i2_status.stale:
+        add_stale_data_warning(response)
 
     return response
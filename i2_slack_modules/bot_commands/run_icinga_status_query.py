@@ -3,9 +3,21 @@ from i2_slack_modules import yes_no, enabled_disabled
 from i2_slack_modules.common import ts_to_date
 from i2_slack_modules.slack_helper import *
 from i2_slack_modules.icinga_connection import *
+from i2_slack_modules.icinga_states import all_icinga_states
 
 max_messages_to_display_detailed_status = 4
 
+# object attributes displayed as short fields in detailed status (title, attribute, formatter)
+detailed_status_fields = (
+    ("Acknowledged", "acknowledgement", yes_no),
+    ("In downtime", "downtime_depth", yes_no),
+    ("Event handlers", "enable_event_handler", enabled_disabled),
+    ("Flap detection", "enable_flapping", enabled_disabled),
+    ("Active checks", "enable_active_checks", enabled_disabled),
+    ("Passive checks", "enable_passive_checks", enabled_disabled),
+    ("Notifications", "enable_notifications", enabled_disabled),
+)
+
 
 # noinspection PyUnusedLocal
 def run_icinga_status_query(config=None,
@@ -49,8 +61,6 @@ def run_icinga_status_query(config=None,
     command_start = None
     status_type = None
 
-    icinga_states = IcingaStates()
-
     # lowercase makes parsing easier
     slack_message = slack_message.lower()
 
@@ -102,9 +112,21 @@ def run_icinga_status_query(config=None,
 
         slack_user.add_last_filter(i2_filter_names)
 
-        i2_response = get_i2_object(config, status_type, i2_filter_status, i2_filter_names, acknowledged, downtime)
-        i2_comments_response = get_i2_object(config, f"{status_type}Comment", i2_filter_status, i2_filter_names)
-        i2_downtime_response = get_i2_object(config, f"{status_type}Downtime", i2_filter_status, i2_filter_names)
+        # these requests don't depend on each other, run them in parallel
+        # outdated data is acceptable for a status display, a warning gets added to the response
+        i2_response_future = i2_request_executor.submit(
+            get_i2_object, config, status_type, i2_filter_status, i2_filter_names, acknowledged, downtime,
+            allow_stale=True)
+        i2_comments_response_future = i2_request_executor.submit(
+            get_i2_object, config, f"{status_type}Comment", i2_filter_status, i2_filter_names, allow_stale=True)
+        i2_downtime_response_future = i2_request_executor.submit(
+            get_i2_object, config, f"{status_type}Downtime", i2_filter_status, i2_filter_names, allow_stale=True)
+
+        i2_response = i2_response_future.result()
+        i2_comments_response = i2_comments_response_future.result()
+        i2_downtime_response = i2_downtime_response_future.result()
+
+        num_objects = len(i2_response.data)
 
         if i2_response.error:
             response = slack_error_response(header="Icinga request error", error_message=i2_response.error)
@@ -115,25 +137,25 @@ def run_icinga_status_query(config=None,
             response.add_block(i2_response.text)
 
         # show more detailed information if only a few objects are returned
-        elif len(i2_response.data) in list(range(1, (max_messages_to_display_detailed_status + 1))):
+        elif 1 <= num_objects <= max_messages_to_display_detailed_status:
 
             response.text = "Icinga status response"
-            block_text = "Found %d matching %s%s" % \
-                         (len(i2_response.data), status_type.lower(), plural(len(i2_response.data)))
+            block_text = f"Found {num_objects} matching {status_type.lower()}{plural(num_objects)}"
 
             response.add_block(block_text)
 
+            object_attachments = list()
             for icinga_object in i2_response.data:
                 if icinga_object.get("host_name"):
                     host_name = icinga_object.get("host_name")
                     service_name = icinga_object.get("name")
                     comment_downtime_service_name = service_name
-                    this_state = icinga_states.value(icinga_object.get("state"), "Service")
+                    this_state = all_icinga_states.value(icinga_object.get("state"), "Service")
                 else:
                     host_name = icinga_object.get("name")
                     service_name = None
                     comment_downtime_service_name = ""
-                    this_state = icinga_states.value(icinga_object.get("state"), "Host")
+                    this_state = all_icinga_states.value(icinga_object.get("state"), "Host")
 
                 attachment_color = this_state.color
 
@@ -141,9 +163,9 @@ def run_icinga_status_query(config=None,
                 service_url = get_web2_slack_url(host_name, service_name, web2_url=config["icinga.web2_url"])
 
                 if icinga_object.get("host_name"):
-                    text = "*%s | %s*" % (host_url, service_url)
+                    text = f"*{host_url} | {service_url}*"
                 else:
-                    text = "*%s*" % host_url
+                    text = f"*{host_url}*"
 
                 # get comments for this object
                 object_comment_list = \
@@ -174,38 +196,32 @@ def run_icinga_status_query(config=None,
                 if icinga_object.get("last_check_result") is not None:
                     status_output = icinga_object.get("last_check_result").get("output")
 
-                object_fields = {
-                    "Output": f"{status_output}",
-                    "Last state change": ts_to_date(icinga_object.get("last_state_change")),
-                    "Status": this_state.name,
-                    "Acknowledged": yes_no(icinga_object.get("acknowledgement")),
-                    "In downtime": yes_no(icinga_object.get("downtime_depth")),
-                    "Event handlers": enabled_disabled(icinga_object.get("enable_event_handler")),
-                    "Flap detection": enabled_disabled(icinga_object.get("enable_flapping")),
-                    "Active checks": enabled_disabled(icinga_object.get("enable_active_checks")),
-                    "Passive checks": enabled_disabled(icinga_object.get("enable_passive_checks")),
-                    "Notifications": enabled_disabled(icinga_object.get("enable_notifications")),
-                }
+                fields = [
+                    {"title": "Output", "value": f"{status_output}", "short": False},
+                    {"title": "Last state change", "value": ts_to_date(icinga_object.get("last_state_change")),
+                     "short": True},
+                    {"title": "Status", "value": this_state.name, "short": True}
+                ]
+                fields.extend([{"title": title, "value": formatter(icinga_object.get(attribute)), "short": True}
+                               for title, attribute, formatter in detailed_status_fields])
 
                 # add comment to object attachment
                 for comment in object_comment_list:
                     this_type = "Comment"
                     if comment.get("entry_type", 1) == 4:
                         this_type = "Acknowledgement"
-                    comment_title = "{} by {} ({})".format(this_type, comment.get("author"),
-                                                           ts_to_date(comment.get("entry_time")))
+                    comment_title = f"{this_type} by {comment.get('author')} ({ts_to_date(comment.get('entry_time'))})"
 
                     # add text and info about expiration
                     comment_text = comment.get("text")
                     if comment.get("expire_time") is not None and comment.get("expire_time") > 0:
-                        comment_text += " (expires: {})".format(ts_to_date(comment.get("expire_time")))
+                        comment_text += f" (expires: {ts_to_date(comment.get('expire_time'))})"
 
-                    object_fields[comment_title] = f"`{comment_text}`"
+                    fields.append({"title": comment_title, "value": f"`{comment_text}`", "short": False})
 
                 # add downtime info to object attachment
                 for downtime in object_downtime_list:
-                    downtime_title = "Downtime by {} ({})".format(downtime.get("author"),
-                                                                  ts_to_date(downtime.get("entry_time")))
+                    downtime_title = f"Downtime by {downtime.get('author')} ({ts_to_date(downtime.get('entry_time'))})"
 
                     # add text and info about expiration
                     downtime_text = downtime.get("comment")
@@ -217,20 +233,9 @@ def run_icinga_status_query(config=None,
                             downtime.get("duration") / 60,
                             ts_to_date(downtime.get("start_time")), ts_to_date(downtime.get("end_time")))
 
-                    object_fields[downtime_title] = f"`{downtime_text}`"
+                    fields.append({"title": downtime_title, "value": f"`{downtime_text}`", "short": False})
 
-                fields = list()
-                for title, value in object_fields.items():
-                    short = True
-                    if any(x in title for x in ["Output", "Comment", "Downtime", "Acknowledgement"]):
-                        short = False
-                    fields.append({
-                        "title": title,
-                        "value": value,
-                        "short": short
-                    })
-
-                response.add_attachment(
+                object_attachments.append(
                     {
                         "color": attachment_color,
                         "text": text,
@@ -238,11 +243,12 @@ def run_icinga_status_query(config=None,
                     }
                 )
 
+            response.add_attachment(object_attachments)
+
         # the more condensed icinga_object list
-        elif len(i2_response.data) > 0:
+        elif num_objects > 0:
 
-            block_text = "Found %d matching %s%s" % \
-                         (len(i2_response.data), status_type.lower(), plural(len(i2_response.data)))
+            block_text = f"Found {num_objects} matching {status_type.lower()}{plural(num_objects)}"
 
             response.text = "Icinga status response"
             response.add_block(block_text)
@@ -269,4 +275,8 @@ def run_icinga_status_query(config=None,
             if len(problematic_text) != 0:
                 response.text += " Everything seems in good condition."
 
+        if not i2_response.error and \
+                any([i2_response.stale, i2_comments_response.stale, i2_downtime_response.stale]):
+            add_stale_data_warning(response)
+
     return response
@@ -162,17 +162,7 @@ def show_command(
     response.add_block(block_text)
 
     # fill blocks with formatted response
-    block_text = ""
-    for response_object in block_text_list:
-
-        if len(block_text) + len(response_object) + 2 > slack_max_block_text_length:
-            response.add_block(block_text)
-            block_text = ""
-
-        block_text += "%s\n\n" % response_object
-
-    else:
-        response.add_block(block_text)
+    add_text_list_to_blocks(response, block_text_list)
 
     return response
 
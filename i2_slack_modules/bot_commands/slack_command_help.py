@@ -1,6 +1,47 @@
 
 from i2_slack_modules.slack_helper import BotResponse
 
+# implemented commands don't change at runtime, the help overview is compiled only once
+help_overview_fields = None
+
+
+def get_help_overview_fields(bot_commands=None):
+    """
+    Return the list of fields describing all implemented commands
+
+    Parameters
+    ----------
+    bot_commands: BotCommands
+        class with bot commands to avoid circular imports
+
+    Returns
+    -------
+    list: help fields for all bot commands
+    """
+
+    fields = list()
+
+    for command in bot_commands:
+        command_shortcut = ""
+        if command.shortcut is not None:
+            if isinstance(command.shortcut, list):
+                command_shortcut = "|".join(command.shortcut)
+            else:
+                command_shortcut = command.shortcut
+
+            command_shortcut = " (%s)" % command_shortcut
+
+        fields.append({
+            "title": "`<bot> %s%s`" % (
+                command.name, command_shortcut
+            ),
+            "value": command.short_description
+        })
+
+    fields.append({"title": "Detailed help", "value": "For a detailed help type `help <command>`", "short": False})
+
+    return fields
+
 
 # noinspection PyUnusedLocal
 def slack_command_help(config=None, slack_message=None, bot_commands=None, *args, **kwargs):
@@ -23,33 +64,22 @@ def slack_command_help(config=None, slack_message=None, bot_commands=None, *args
     BotResponse: with help text
     """
 
+    global help_overview_fields
+
     github_logo_url = "https://github.githubassets.com/images/modules/logos_page/GitHub-Mark.png"
     fields = list()
     help_color = "#03A8F3"
     help_headline = None
 
     if slack_message is None or slack_message.strip().lower() == "help":
-        for command in bot_commands:
-            command_shortcut = ""
-            if command.shortcut is not None:
-                if isinstance(command.shortcut, list):
-                    command_shortcut = "|".join(command.shortcut)
-                else:
-                    command_shortcut = command.shortcut
 
-                command_shortcut = " (%s)" % command_shortcut
+        if help_overview_fields is None:
+            help_overview_fields = get_help_overview_fields(bot_commands)
 
-            fields.append({
-                "title": "`<bot> %s%s`" % (
-                    command.name, command_shortcut
-                ),
-                "value": command.short_description
-            })
+        fields = list(help_overview_fields)
 
         help_headline = "Following commands are implemented"
 
-        fields.append({"title": "Detailed help", "value": "For a detailed help type `help <command>`", "short": False})
-
     else:
         # user asked for detailed help
         requested_help_topic = slack_message[4:].strip()
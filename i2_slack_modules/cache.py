@@ -0,0 +1,99 @@
+####
+#
+#   Simple in memory cache for Icinga2 API responses
+#
+
+import copy
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+
+class RequestCache:
+    """
+    A class used to hold Icinga2 API responses for a short amount of time.
+
+    Entries younger then 'timeout' seconds are considered fresh and will be
+    returned instead of querying Icinga2 again. Older entries are kept until
+    'stale_timeout' is reached and will only be returned if requested
+    explicitly, i.e. if Icinga2 can't be reached.
+
+    Expired entries are removed whenever a new entry is added. If the cache
+    still holds 'max_entries' entries, the least recently updated one is removed.
+
+    Attributes
+    ----------
+    timeout : int
+        seconds an entry is considered fresh
+    stale_timeout : int
+        seconds an entry is kept as fallback if Icinga2 requests fail
+    max_entries : int
+        maximum number of entries kept in cache
+
+    Methods
+    -------
+    get(key, allow_stale=False)
+        return a copy of cached data for key or None
+    set(key, data)
+        add or update cached data for key
+    clear()
+        remove all entries from cache
+    """
+
+    def __init__(self, timeout=10, stale_timeout=300, max_entries=100):
+        self.timeout = timeout
+        self.stale_timeout = stale_timeout
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, allow_stale=False):
+
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is None:
+                return None
+
+            entry_age = datetime.now().timestamp() - entry["last_updated"]
+
+            if entry_age > self.stale_timeout:
+                del self.entries[key]
+                return None
+
+        if entry_age > self.timeout and allow_stale is False:
+            return None
+
+        logging.debug("Returning %s cache entry (age: %.1fs) for: %s" %
+                      ("fresh" if entry_age <= self.timeout else "stale", entry_age, key))
+
+        # return a copy as callers are allowed to alter returned lists
+        return copy.copy(entry["data"])
+
+    def set(self, key, data):
+
+        now = datetime.now().timestamp()
+
+        with self.lock:
+            # entries are ordered by last update, oldest first
+            self.entries.pop(key, None)
+
+            while len(self.entries) > 0:
+                oldest_entry = next(iter(self.entries.values()))
+                if now - oldest_entry["last_updated"] <= self.stale_timeout and \
+                        len(self.entries) < self.max_entries:
+                    break
+                self.entries.popitem(last=False)
+
+            self.entries[key] = {
+                "data": copy.copy(data),
+                "last_updated": now
+            }
+
+    def clear(self):
+
+        with self.lock:
+            self.entries = OrderedDict()
+
+# EOF
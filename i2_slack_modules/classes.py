@@ -3,6 +3,7 @@
 # Define commonly used classes
 #
 
+import asyncio
 import json
 import logging
 from datetime import datetime
@@ -26,11 +27,11 @@ class BotResponse:
 
     Methods
     -------
-    add_blocks(block)
-        add a Slack message block. If 'block' is a string it will be converted into
-        a block using method get_single_block()
+    add_block(block)
+        add a Slack message block or a list of blocks. If 'block' is a string it
+        will be converted into a block using method get_single_block()
     add_attachment(attachment)
-        adds a new attachment to this response.
+        adds a new attachment or a list of attachments to this response.
     dump_attachments()
         returns this.attachments as json blob
     get_single_block(text)
@@ -152,8 +153,13 @@ class SlackConversation:
 
 class SlackUser:
 
+    # conversation_timeout defines after how many seconds
+    # an abandoned conversation will be discarded
+    conversation_timeout = 1800
+
     last_filter = None
     conversation = None
+    conversation_last_updated = 0
     id = None
     data = dict()
     data_last_updated = 0
@@ -163,10 +169,27 @@ class SlackUser:
         if data is not None:
             self.data = data
 
+        # messages of a user are handled one after another to keep the conversation in order
+        self.message_lock = asyncio.Lock()
+
     def reset_conversation(self):
         if self.conversation is not None:
             self.conversation = None
 
+    def reset_expired_conversation(self):
+        """
+        Reset the conversation if the user didn't talk to the bot for
+        more then conversation_timeout seconds.
+        """
+
+        now = datetime.now().timestamp()
+
+        if self.conversation is not None and self.conversation_last_updated + self.conversation_timeout < now:
+            logging.debug("Conversation expired after %d seconds, resetting it." % self.conversation_timeout)
+            self.reset_conversation()
+
+        self.conversation_last_updated = now
+
     def start_conversation(self):
 
         if self.conversation is None:
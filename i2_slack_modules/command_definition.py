@@ -17,7 +17,7 @@ from i2_slack_modules.bot_commands import (
     show_command
 )
 import logging
-from typing import Callable, Tuple, Optional
+from typing import Callable, List, Tuple, Optional
 
 enable_disable_sub_commands = [
     {
@@ -471,6 +471,30 @@ class BotCommands:
         def __repr__(self) -> str:
             return str(self.__dict__)
 
+        def get_command_starts(self) -> List[str]:
+            """
+            This method will return the command name and all
+            shortcuts a Slack message can start with to call
+            this command.
+
+            Returns
+            -------
+            list: command name and shortcuts
+            """
+
+            command_starts_with = [self.name]
+
+            if self.shortcut:
+                if isinstance(self.shortcut, list):
+                    command_starts_with.extend(self.shortcut)
+                elif isinstance(self.shortcut, str):
+                    command_starts_with.append(self.shortcut)
+                else:
+                    logging.error("Error parsing \"implemented_commands\". "
+                                  "Command (%s) shortcut must be a string or a list" % self.name)
+
+            return command_starts_with
+
         def split_message(self, slack_message: str) -> Tuple[Optional[str], Optional[str]]:
             """
             This method will split a Slack message into the command part
@@ -493,19 +517,8 @@ class BotCommands:
             command_string_identified = None
             slack_message_without_command = None
 
-            command_starts_with = [self.name]
-
-            if self.shortcut:
-                if isinstance(self.shortcut, list):
-                    command_starts_with.extend(self.shortcut)
-                elif isinstance(self.shortcut, str):
-                    command_starts_with.append(self.shortcut)
-                else:
-                    logging.error("Error parsing \"implemented_commands\". "
-                                  "Command (%s) shortcut must be a string or a list" % self.name)
-
             # iterate over possible command starts and return if match was found
-            for command_start in command_starts_with:
+            for command_start in self.get_command_starts():
                 if slack_message.lower() == command_start.lower() or \
                         slack_message.lower().startswith(command_start.lower() + " "):
 
@@ -571,8 +584,19 @@ class BotCommands:
         """
         if command_list is None:
             command_list = implemented_commands
+
+        # commands indexed by the first word they can be called with
+        self._commands_by_first_word = dict()
+
         for command in command_list:
-            setattr(self, command.get("name").replace(" ", "_"), self._SingleCommand(command))
+            single_command = self._SingleCommand(command)
+            setattr(self, command.get("name").replace(" ", "_"), single_command)
+
+            for command_start in single_command.get_command_starts():
+                first_word_commands = \
+                    self._commands_by_first_word.setdefault(command_start.lower().split(" ", 1)[0], list())
+                if single_command not in first_word_commands:
+                    first_word_commands.append(single_command)
 
     def get_command_called(self, slack_message: str) -> _SingleCommand:
         """
@@ -587,7 +611,9 @@ class BotCommands:
         -------
         dict: response with command object if found
         """
-        for command in self:
+
+        # only check commands which can be called with the first word of this message
+        for command in self._commands_by_first_word.get(slack_message.lower().split(" ", 1)[0], list()):
             command_part, _ = command.split_message(slack_message)
             if command_part:
                 return command
@@ -596,5 +622,6 @@ class BotCommands:
         return str(self.__dict__)
 
     def __iter__(self) -> _SingleCommand:
-        for command in self.__dict__:
-            yield getattr(self, command)
+        for command in self.__dict__.values():
+            if isinstance(command, self._SingleCommand):
+                yield command
@@ -3,12 +3,17 @@
 # Some commonly used functions
 #
 
+import atexit
 import configparser
 import logging
+import logging.handlers
+import queue
 from argparse import ArgumentParser, RawDescriptionHelpFormatter
 from datetime import datetime
+from functools import lru_cache
 import inspect
 import re
+import time
 
 from ctparse import ctparse
 
@@ -16,6 +21,12 @@ from ctparse import ctparse
 # define valid log levels
 valid_log_levels = ["DEBUG", "INFO", "WARNING", "ERROR"]
 
+# parsed relative dates are cached for this amount of seconds
+relative_date_cache_window = 30
+
+# used to parse the answer to a confirmation question
+confirmation_answer_regex = re.compile(r"^(?:(?P<yes>y)|(?P<no>n))", re.IGNORECASE)
+
 
 def parse_command_line(version=None,
                        self_description=None,
@@ -69,7 +80,7 @@ def parse_own_config(args, default_log_level):
 
     config_file = args.config_file
 
-    logging.debug("Parsing daemon config file: %s" % config_file)
+    logging.debug("Parsing daemon config file: %s", config_file)
 
     if config_file is None or config_file == "":
         do_error_exit("Config file not defined.")
@@ -82,81 +93,87 @@ def parse_own_config(args, default_log_level):
 
     # noinspection PyBroadException
     try:
-        config_handler.read_file(open(config_file))
+        with open(config_file) as config_file_handle:
+            config_handler.read_file(config_file_handle)
     except configparser.Error as e:
         do_error_exit("Error during config file parsing: %s" % e)
     # noinspection PyBroadException
     except Exception:
         do_error_exit("Unable to open file '%s'" % config_file)
 
+    # read all options only once, keys are looked up in plain dicts afterwards
+    config_sections = {section: dict(config_handler.items(section)) for section in config_handler.sections()}
+
     # read logging section
     this_section = "main"
-    if this_section not in config_handler.sections():
-        logging.warning("Section '%s' not found in '%s'" % (this_section, config_file))
+    if this_section not in config_sections:
+        logging.warning("Section '%s' not found in '%s'", this_section, config_file)
 
     # read logging if present
-    config_dict["log_level"] = config_handler.get(this_section, "log_level", fallback=default_log_level)
+    config_dict["log_level"] = config_sections.get(this_section, dict()).get("log_level", default_log_level)
 
     # overwrite log level with command line argument
     if args.log_level is not None and args.log_level != "":
         config_dict["log_level"] = args.log_level
-        logging.info("Config: overwriting log_level with command line arg: %s" % args.log_level)
+        logging.info("Config: overwriting log_level with command line arg: %s", args.log_level)
 
-    # set log level again
-    if args.log_level is not config_dict["log_level"]:
+    # set log level again if it differs from the one set during logging setup
+    if config_dict["log_level"].upper() != (args.log_level or default_log_level).upper():
         set_log_level(config_dict["log_level"])
 
-    logging.debug("Config: %s = %s" % ("log_level", config_dict["log_level"]))
+    logging.debug("Config: %s = %s", "log_level", config_dict["log_level"])
 
     # read common section
     this_section = "slack"
-    if this_section not in config_handler.sections():
+    if this_section not in config_sections:
         do_error_exit("Section '%s' not found in '%s'" % (this_section, config_file))
     else:
-        config_dict["slack.bot_token"] = config_handler.get(this_section, "bot_token", fallback="")
-        logging.debug("Config: %s = %s***" % ("slack.bot_token", config_dict["slack.bot_token"][0:10]))
-        config_dict["slack.default_channel"] = config_handler.get(this_section, "default_channel", fallback="")
-        logging.debug("Config: %s = %s" % ("slack.default_channel", config_dict["slack.default_channel"]))
+        config_dict["slack.bot_token"] = config_sections[this_section].get("bot_token", "")
+        logging.debug("Config: %s = %s***", "slack.bot_token", config_dict["slack.bot_token"][0:10])
+        config_dict["slack.default_channel"] = config_sections[this_section].get("default_channel", "")
+        logging.debug("Config: %s = %s", "slack.default_channel", config_dict["slack.default_channel"])
 
     # read paths section
     this_section = "icinga"
-    if this_section not in config_handler.sections():
+    if this_section not in config_sections:
         do_error_exit("Section '%s' not found in '%s'" % (this_section, config_file))
     else:
-        config_dict["icinga.hostname"] = config_handler.get(this_section, "hostname", fallback="")
-        logging.debug("Config: %s = %s" % ("icinga.hostname", config_dict["icinga.hostname"]))
-        config_dict["icinga.port"] = config_handler.get(this_section, "port", fallback="")
-        logging.debug("Config: %s = %s" % ("icinga.port", config_dict["icinga.port"]))
-        config_dict["icinga.username"] = config_handler.get(this_section, "username", fallback="")
-        logging.debug("Config: %s = %s" % ("icinga.username", config_dict["icinga.username"]))
-        config_dict["icinga.password"] = config_handler.get(this_section, "password", fallback="")
-        logging.debug("Config: %s = %s***" % ("icinga.password", config_dict["icinga.password"][0:3]))
-        config_dict["icinga.web2_url"] = config_handler.get(this_section, "web2_url", fallback="")
-        logging.debug("Config: %s = %s" % ("icinga.web2_url", config_dict["icinga.web2_url"]))
-        config_dict["icinga.certificate"] = config_handler.get(this_section, "certificate", fallback="")
-        logging.debug("Config: %s = %s" % ("icinga.certificate", config_dict["icinga.certificate"]))
-        config_dict["icinga.key"] = config_handler.get(this_section, "key", fallback="")
-        logging.debug("Config: %s = %s" % ("icinga.key", config_dict["icinga.key"]))
-        config_dict["icinga.ca_certificate"] = config_handler.get(this_section, "ca_certificate", fallback="")
-        logging.debug("Config: %s = %s" % ("icinga.ca_certificate", config_dict["icinga.ca_certificate"]))
-        config_dict["icinga.timeout"] = config_handler.get(this_section, "timeout", fallback="")
-        logging.debug("Config: %s = %s" % ("icinga.timeout", config_dict["icinga.timeout"]))
-        config_dict["icinga.filter"] = config_handler.get(this_section, "filter", fallback="")
-        logging.debug("Config: %s = %s" % ("icinga.filter", config_dict["icinga.filter"]))
-        config_dict["icinga.max_returned_results"] = \
-            config_handler.get(this_section, "max_returned_results", fallback="")
-        logging.debug("Config: %s = %s" % ("icinga.max_returned_results", config_dict["icinga.max_returned_results"]))
+        config_dict["icinga.hostname"] = config_sections[this_section].get("hostname", "")
+        logging.debug("Config: %s = %s", "icinga.hostname", config_dict["icinga.hostname"])
+        config_dict["icinga.port"] = config_sections[this_section].get("port", "")
+        logging.debug("Config: %s = %s", "icinga.port", config_dict["icinga.port"])
+        config_dict["icinga.username"] = config_sections[this_section].get("username", "")
+        logging.debug("Config: %s = %s", "icinga.username", config_dict["icinga.username"])
+        config_dict["icinga.password"] = config_sections[this_section].get("password", "")
+        logging.debug("Config: %s = %s***", "icinga.password", config_dict["icinga.password"][0:3])
+        config_dict["icinga.web2_url"] = config_sections[this_section].get("web2_url", "")
+        logging.debug("Config: %s = %s", "icinga.web2_url", config_dict["icinga.web2_url"])
+        config_dict["icinga.certificate"] = config_sections[this_section].get("certificate", "")
+        logging.debug("Config: %s = %s", "icinga.certificate", config_dict["icinga.certificate"])
+        config_dict["icinga.key"] = config_sections[this_section].get("key", "")
+        logging.debug("Config: %s = %s", "icinga.key", config_dict["icinga.key"])
+        config_dict["icinga.ca_certificate"] = config_sections[this_section].get("ca_certificate", "")
+        logging.debug("Config: %s = %s", "icinga.ca_certificate", config_dict["icinga.ca_certificate"])
+        config_dict["icinga.timeout"] = config_sections[this_section].get("timeout", "")
+        logging.debug("Config: %s = %s", "icinga.timeout", config_dict["icinga.timeout"])
+        config_dict["icinga.filter"] = config_sections[this_section].get("filter", "")
+        logging.debug("Config: %s = %s", "icinga.filter", config_dict["icinga.filter"])
+        config_dict["icinga.max_returned_results"] = config_sections[this_section].get("max_returned_results", "")
+        logging.debug("Config: %s = %s", "icinga.max_returned_results", config_dict["icinga.max_returned_results"])
+        config_dict["icinga.cache_timeout"] = config_sections[this_section].get("cache_timeout", "")
+        logging.debug("Config: %s = %s", "icinga.cache_timeout", config_dict["icinga.cache_timeout"])
 
     for key, value in config_dict.items():
-        if value is "":
+        if value == "":
             # if we use a certificate then don't care if user or password are defined
             if key in ["icinga.username", "icinga.password"] and config_dict["icinga.certificate"] != "":
                 continue
             # these vars can be empty
             if key in ["icinga.key", "icinga.certificate", "icinga.web2_url", "icinga.ca_certificate",
-                       "icinga.filter", "icinga.max_returned_results", "icinga.timeout"]:
+                       "icinga.filter", "icinga.max_returned_results", "icinga.timeout",
+                       "icinga.cache_timeout"]:
                 continue
-            logging.error("Config: option '%s' undefined or empty!" % key)
+            logging.error("Config: option '%s' undefined or empty!", key)
             config_error = True
 
     if config_error:
@@ -225,8 +242,16 @@ def setup_logging(args=None, default_log_level=None):
     log_level = args.log_level
 
     if args.daemon:
+        # write log records to stderr from a separate thread to keep message handling
+        # free of I/O, records are formatted by the queue handler already
+        log_queue = queue.Queue(-1)
+        log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+        log_listener.start()
+        atexit.register(log_listener.stop)
+
         # omit time stamp if run in daemon mode
-        logging.basicConfig(level="DEBUG", format='%(levelname)s: %(message)s')
+        logging.basicConfig(level="DEBUG", format='%(levelname)s: %(message)s',
+                            handlers=[logging.handlers.QueueHandler(log_queue)])
     else:
         logging.basicConfig(level="DEBUG", format='%(asctime)s - %(levelname)s: %(message)s')
 
@@ -293,6 +318,36 @@ def parse_relative_date(data_to_parse=None):
         logging.warning("Trying to parse date but submitted data is not a string or a list.")
         return None
 
+    parsed_data = _parse_relative_date_string(string_to_parse, int(time.time()) // relative_date_cache_window)
+
+    # return a copy as the cached dict must not be altered
+    if parsed_data is not None:
+        parsed_data = dict(parsed_data)
+
+    return parsed_data
+
+
+@lru_cache(maxsize=256)
+def _parse_relative_date_string(string_to_parse, time_window):
+    """
+    Parse a string of relative date and/or time with ctparse.
+
+    Results are cached as ctparse is rather expensive. As the result depends on
+    the current time, 'time_window' is part of the cache key and defines
+    how long a parsed result can be reused.
+
+    Parameters
+    ----------
+    string_to_parse : string
+        string with relative time information
+    time_window : int
+        current time divided by 'relative_date_cache_window'
+
+    Returns
+    -------
+    dict: date/time data + datetime object, see parse_relative_date()
+    """
+
     logging.debug("%s START ctparse %s" % ("*" * 10, "*" * 50))
     parsed_date = ctparse(string_to_parse)
     logging.debug("%s END ctparse %s" % ("*" * 10, "*" * 52))
@@ -5,24 +5,53 @@
 
 import json
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 
 # internal
-from .icinga_states import IcingaStates
+from .icinga_states import all_icinga_states
 from .common import quoted_split
+from .cache import RequestCache
 
 # external
 from icinga2apic.client import Client, Icinga2ApiException
 
+# cache Icinga2 responses for a short time to answer repeated commands faster
+i2_status_cache = RequestCache(timeout=15)
+i2_object_cache = RequestCache(timeout=5)
+
+# used to run independent Icinga2 requests in parallel
+i2_request_executor = ThreadPoolExecutor(max_workers=4)
+
+# attributes requested for each object type
+i2_comment_attrs = ('author', 'text', 'host_name', 'service_name', 'entry_time', 'expire_time', 'type',
+                    'entry_type', 'name')
+i2_downtime_attrs = ('author', 'comment', 'host_name', 'service_name', 'entry_time', 'start_time', 'end_time',
+                     'fixed', 'duration', 'type', 'name')
+i2_host_attrs = ('name', 'state', 'last_check_result', 'acknowledgement', 'downtime_depth', 'last_state_change',
+                 'enable_active_checks', 'enable_event_handler', 'enable_flapping', 'enable_notifications',
+                 'enable_passive_checks')
+i2_service_attrs = i2_host_attrs + ('host_name',)
+
+# Icinga2 client handles are reused, indexed by their connection parameters
+i2_client_handles = dict()
+i2_client_handles_lock = threading.Lock()
+
 
 class RequestResponse:
     """
     A class used to hold responses for different kinds of requests
+
+    'stale' is True if the request failed and data was taken from
+    an outdated cache entry instead.
     """
 
     data = list()
     filter = None
     response = None
     error = None
+    stale = False
 
     def __init__(self,
                  response=None,
@@ -33,7 +62,7 @@ class RequestResponse:
             self.data = response
         self.text = text
         self.error = error
-        self.filter = filter
+        self.filter = None
 
     def __repr__(self):
         return str(self.__dict__)
@@ -42,6 +71,9 @@ class RequestResponse:
 def setup_icinga_connection(config):
     """Setup an Icinga connection and pass all parameters
 
+    The client handle is created once and reused for following calls
+    with the same connection parameters.
+
     Parameters
     ----------
     config : dict
@@ -65,24 +97,37 @@ def setup_icinga_connection(config):
     if config["icinga.timeout"] is not None and str(config["icinga.timeout"]) != "":
         icinga_timeout = int(config["icinga.timeout"])
 
-    try:
-        i2_handle = Client(url="https://" + config["icinga.hostname"] + ":" + config["icinga.port"],
-                           username=config["icinga.username"], password=config["icinga.password"],
-                           certificate=config["icinga.certificate"], key=config["icinga.key"],
-                           ca_certificate=config["icinga.ca_certificate"], timeout=icinga_timeout)
+    connection_parameters = (config["icinga.hostname"], config["icinga.port"],
+                             config["icinga.username"], config["icinga.password"],
+                             config["icinga.certificate"], config["icinga.key"],
+                             config["icinga.ca_certificate"], icinga_timeout)
 
-    except Icinga2ApiException as e:
-        i2_error = str(e)
-        logging.error("Unable to set up Icinga2 connection: %s" % i2_error)
-        pass
+    with i2_client_handles_lock:
+
+        i2_handle = i2_client_handles.get(connection_parameters)
+
+        if i2_handle is not None:
+            return i2_handle, i2_error
+
+        try:
+            i2_handle = Client(url="https://" + config["icinga.hostname"] + ":" + config["icinga.port"],
+                               username=config["icinga.username"], password=config["icinga.password"],
+                               certificate=config["icinga.certificate"], key=config["icinga.key"],
+                               ca_certificate=config["icinga.ca_certificate"], timeout=icinga_timeout)
 
-    if not i2_error:
-        logging.debug("Successfully connected to Icinga2")
+        except Icinga2ApiException as e:
+            i2_error = str(e)
+            logging.error("Unable to set up Icinga2 connection: %s" % i2_error)
+            pass
+
+        if not i2_error:
+            logging.debug("Successfully connected to Icinga2")
+            i2_client_handles[connection_parameters] = i2_handle
 
     return i2_handle, i2_error
 
 
-def get_i2_status(config=None, application=None):
+def get_i2_status(config=None, application=None, allow_stale=False):
     """Request Icinga2 API Endpoint /v1/status
 
     Parameters
@@ -93,6 +138,9 @@ def get_i2_status(config=None, application=None):
     application : str, optional
         application to request (defaults are all applications)
 
+    allow_stale : bool, optional
+        if True, return outdated cached data if request fails (default is False)
+
     Returns
     -------
     RequestResponse: with Icinga2 status
@@ -100,6 +148,13 @@ def get_i2_status(config=None, application=None):
 
     response = RequestResponse()
 
+    cache_key = ("status", application)
+
+    cached_data = i2_status_cache.get(cache_key)
+    if cached_data is not None:
+        response.data = cached_data
+        return response
+
     i2_handle, i2_error = setup_icinga_connection(config)
 
     if not i2_handle:
@@ -118,10 +173,21 @@ def get_i2_status(config=None, application=None):
         logging.error("Unable to query Icinga2 status: %s" % response.error)
         pass
 
+    if response.error is None:
+        i2_status_cache.set(cache_key, response.data)
+    elif allow_stale is True:
+        # fall back to last known status
+        cached_data = i2_status_cache.get(cache_key, allow_stale=True)
+        if cached_data is not None:
+            logging.warning("Using cached Icinga2 status as request failed: %s" % response.error)
+            response = RequestResponse(response=cached_data)
+            response.stale = True
+
     return response
 
 
-def get_i2_object(config, object_type="Host", filter_states=None, filter_names=None, acknowledged=None, downtime=None):
+def get_i2_object(config, object_type="Host", filter_states=None, filter_names=None, acknowledged=None, downtime=None,
+                  allow_stale=False):
     """Request Icinga2 API Endpoint /v1/objects
 
     Parameters
@@ -144,6 +210,9 @@ def get_i2_object(config, object_type="Host", filter_states=None, filter_names=N
         if None, downtime filter will NOT be added
         if True, only objects in downtime are requested
         if False, only objects not in downtime are requested
+    allow_stale : bool, optional
+        if True, return outdated cached objects if request fails. Must not be used
+        to select objects for actions (default is False)
 
     Returns
     -------
@@ -153,34 +222,20 @@ def get_i2_object(config, object_type="Host", filter_states=None, filter_names=N
     response = RequestResponse()
     i2_filters = None
 
-    i2_handle, i2_error = setup_icinga_connection(config)
-
-    if not i2_handle:
-        if i2_error is not None:
-            return RequestResponse(error=i2_error)
-        else:
-            return RequestResponse(error="Unknown error while setting up Icinga2 connection")
-
     # default attributes to query
     if "Comment" in object_type:
-        list_attrs = ['author', 'text', 'host_name', 'service_name', 'entry_time', 'expire_time', 'type',
-                      'entry_type', 'name']
+        list_attrs = i2_comment_attrs
     elif "Downtime" in object_type:
-        list_attrs = ['author', 'comment', 'host_name', 'service_name', 'entry_time', 'start_time', 'end_time',
-                      'fixed', 'duration', 'type', 'name']
+        list_attrs = i2_downtime_attrs
+    elif object_type == "Service":
+        list_attrs = i2_service_attrs
     else:
-        list_attrs = ['name', 'state', 'last_check_result', 'acknowledgement', 'downtime_depth', 'last_state_change',
-                      'enable_active_checks', 'enable_event_handler', 'enable_flapping', 'enable_notifications',
-                      'enable_passive_checks']
-
-    # add host_name to attribute list if services are requested
-    if object_type is "Service":
-        list_attrs.append("host_name")
+        list_attrs = i2_host_attrs
 
     if filter_states:
         i2_filters = '(' + ' || '.join(filter_states) + ')'
 
-    if filter_names and len(filter_names) >= 1 and filter_names[0] is not "":
+    if filter_names and len(filter_names) >= 1 and filter_names[0] != "":
 
         filter_names = quoted_split(string_to_split=" ".join(filter_names))
 
@@ -244,8 +299,26 @@ def get_i2_object(config, object_type="Host", filter_states=None, filter_names=N
     else:
         requested_object_type = object_type
 
+    cache_key = ("objects", object_type, i2_filters)
+
+    cached_data = i2_object_cache.get(cache_key)
+    if cached_data is not None:
+        response.data = cached_data
+        if i2_filters is not None and len(i2_filters) > 0:
+            response.filter = i2_filters
+        return response
+
+    i2_handle, i2_error = setup_icinga_connection(config)
+
+    if not i2_handle:
+        if i2_error is not None:
+            return RequestResponse(error=i2_error)
+        else:
+            return RequestResponse(error="Unknown error while setting up Icinga2 connection")
+
     try:
-        response.data = i2_handle.objects.list(object_type=requested_object_type, attrs=list_attrs, filters=i2_filters)
+        response.data = i2_handle.objects.list(object_type=requested_object_type, attrs=list(list_attrs),
+                                               filters=i2_filters)
 
     except Icinga2ApiException as e:
         response.error = str(e)
@@ -269,31 +342,56 @@ def get_i2_object(config, object_type="Host", filter_states=None, filter_names=N
         pass
 
     if response.error is None and response.data is not None and isinstance(response.data, list):
-        response_objects = list()
-        for response_object in response.data:
-            response_objects.append(response_object.get("attrs"))
-        response.data = response_objects
+        response.data = [response_object.get("attrs") for response_object in response.data]
 
         # sort objects
-        if object_type is "Host":
-            response.data = sorted(response.data, key=lambda k: k['name'])
-        elif object_type is "Service":
-            response.data = sorted(response.data, key=lambda k: (k['host_name'], k['name']))
+        if object_type == "Host":
+            response.data.sort(key=itemgetter("name"))
+        elif object_type == "Service":
+            response.data.sort(key=itemgetter("host_name", "name"))
         elif "Comment" in object_type or "Downtime" in object_type:
-            response.data = sorted(response.data, key=lambda k: k['entry_time'], reverse=True)
+            response.data.sort(key=itemgetter("entry_time"), reverse=True)
 
-        logging.debug("Icinga2 returned with %d results" % len(response.data))
+        logging.debug("Icinga2 returned with %d results", len(response.data))
 
         # add used filters to response
         if i2_filters is not None and len(i2_filters) > 0:
             response.filter = i2_filters
 
+        # don't cache "not found" answers as they only contain a text
+        if response.text is None:
+            i2_object_cache.set(cache_key, response.data)
+
     if response.error:
         logging.error("Unable to query Icinga2 status: %s" % response.error)
 
+        # fall back to last known objects if caller accepts outdated data
+        cached_data = None
+        if allow_stale is True:
+            cached_data = i2_object_cache.get(cache_key, allow_stale=True)
+
+        if cached_data is not None:
+            logging.warning("Using cached Icinga2 objects as request failed: %s" % response.error)
+            response = RequestResponse()
+            response.data = cached_data
+            response.stale = True
+            if i2_filters is not None and len(i2_filters) > 0:
+                response.filter = i2_filters
+
     return response
 
 
+def clear_i2_cache():
+    """
+    Remove all cached Icinga2 responses
+
+    Needs to be called after any action which alters Icinga2 objects.
+    """
+
+    i2_status_cache.clear()
+    i2_object_cache.clear()
+
+
 def get_i2_filter(object_type="Host", slack_message=""):
     """Parse a Slack message and create lists of filters depending on the
     object type
@@ -320,7 +418,7 @@ def get_i2_filter(object_type="Host", slack_message=""):
 
     logging.debug("Start compiling Icinga2 filters for received message: %s" % slack_message)
 
-    if slack_message.strip() is not "":
+    if slack_message.strip() != "":
         # clean up the slack message from autogenerated links
         logging.info("Slack Message: %s" % slack_message)
         if '|' in slack_message:
@@ -328,7 +426,7 @@ def get_i2_filter(object_type="Host", slack_message=""):
 
         filter_options = quoted_split(string_to_split=slack_message, preserve_quotations=True)
 
-    valid_filter_states = IcingaStates()
+    valid_filter_states = all_icinga_states
 
     # use a copy of filter_options to not remove items from current iteration
     for filter_option in list(filter_options):
@@ -55,6 +55,9 @@ icinga_state_types = [
     }
 ]
 
+# used to look up a state name by object type and state value
+icinga_state_names = {(state["object"], state["value"]): state["name"] for state in icinga_state_types}
+
 
 class IcingaStates:
     """
@@ -103,9 +106,9 @@ class IcingaStates:
         -------
         _SingleState: with the state searched for
         """
-        for state in self:
-            if state.value == state_value and state.object == object_type:
-                return state
+        state_name = icinga_state_names.get((object_type, state_value))
+        if state_name is not None:
+            return getattr(self, state_name)
 
     def name(self, name: str) -> _SingleState:
         """
@@ -131,3 +134,7 @@ class IcingaStates:
     def __iter__(self) -> _SingleState:
         for state in self.__dict__:
             yield getattr(self, state)
+
+
+# states don't change at runtime, this instance is shared by all callers
+all_icinga_states = IcingaStates()
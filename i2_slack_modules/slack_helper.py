@@ -3,15 +3,28 @@
 # Some Slack helper function to format messages properly
 #
 
+from functools import lru_cache
+
 from . import plural, slack_max_block_text_length
 from .classes import BotResponse
-from .icinga_states import IcingaStates
+from .icinga_states import all_icinga_states
+
+# templates used to format a single line of a condensed status response
+host_status_line_template = "{state_emoji} {url}{additional_info}: {output}"
+service_status_line_template = "&gt;{state_emoji} {url}{additional_info}: {output}"
+host_services_header_template = "*{url}* ({num_services} service{plural})"
 
+# added to responses which contain cached data as Icinga2 couldn't be reached
+stale_data_warning = ":warning: _Icinga2 request failed, showing cached data which might be outdated_"
 
+
+@lru_cache(maxsize=1024)
 def get_web2_slack_url(host, service=None, web2_url=""):
     """
     Return a Slack formatted hyperlink
 
+    Results are cached as the same hosts are linked many times per response.
+
     Parameters
     ----------
     host: str
@@ -69,10 +82,19 @@ def format_slack_response(config, object_type="Host", result_objects=None, comme
     service_list = list()
     response_objects = list()
     num_results = 0
-    icinga_states = IcingaStates()
+    web2_url = config["icinga.web2_url"]
+
+    max_returned_results = None
+    if config["icinga.max_returned_results"] != "":
+        max_returned_results = int(config["icinga.max_returned_results"])
 
     if result_objects and len(result_objects) != 0:
 
+        # index comment and downtime types by object once instead of scanning the list for every object
+        comment_downtime_types = dict()
+        for item in comment_downtime_list or list():
+            comment_downtime_types.setdefault((item["host_name"], item["service_name"]), set()).add(item["type"])
+
         # append an "end marker" to avoid code redundancy
         result_objects.append({"last_object": True})
 
@@ -85,24 +107,21 @@ def format_slack_response(config, object_type="Host", result_objects=None, comme
             if last_check is not None:
                 output = last_check.get("output")
 
-            # get comments for this object
-            if object_type is "Host":
-                object_comment_downtime_list = \
-                    [item for item in comment_downtime_list
-                     if item["host_name"] == result_object.get("name") and item["service_name"] == ""]
+            # get comment and downtime types for this object
+            if object_type == "Host":
+                object_comment_downtime_key = (result_object.get("name"), "")
             else:
-                object_comment_downtime_list = \
-                    [item for item in comment_downtime_list
-                     if item["host_name"] == result_object.get("host_name") and
-                        item["service_name"] == result_object.get("name")]
+                object_comment_downtime_key = (result_object.get("host_name"), result_object.get("name"))
+
+            object_comment_downtime_types = comment_downtime_types.get(object_comment_downtime_key, set())
 
             # add speech bubble if object has comments
             append_to_title = ""
-            if len([item for item in object_comment_downtime_list if item['type'] == 'Comment']) > 0:
+            if "Comment" in object_comment_downtime_types:
                 append_to_title += " :speech_balloon:"
 
             # add zzz if object has downtime
-            if len([item for item in object_comment_downtime_list if item['type'] == 'Downtime']) > 0:
+            if "Downtime" in object_comment_downtime_types:
                 append_to_title += " :zzz:"
 
             # change attachment color and add hint to status text if object is taken care of
@@ -110,17 +129,17 @@ def format_slack_response(config, object_type="Host", result_objects=None, comme
                 if result_object.get("acknowledgement") >= 1 or result_object.get("downtime_depth") >= 1:
                     append_to_title += " (handled)"
 
-            if object_type is "Host":
+            if object_type == "Host":
 
                 # stop if we found the "end marker"
                 if result_object.get("last_object"):
                     break
 
-                text = "{state_emoji} {url}{additional_info}: {output}".format(
-                    state_emoji=icinga_states.value(result_object.get("state"), object_type).icon,
-                    url=get_web2_slack_url(result_object.get("name"), web2_url=config["icinga.web2_url"]),
+                text = host_status_line_template.format(
+                    state_emoji=all_icinga_states.value(result_object.get("state"), object_type).icon,
+                    url=get_web2_slack_url(result_object.get("name"), web2_url=web2_url),
                     additional_info=append_to_title,
-                    output=f"{output}"
+                    output=output
                 )
 
                 response_objects.append(text)
@@ -129,10 +148,10 @@ def format_slack_response(config, object_type="Host", result_objects=None, comme
                 if (current_host and current_host != result_object.get("host_name")) or \
                         result_object.get("last_object"):
 
-                    text = "*%s* (%d service%s)" % (
-                        get_web2_slack_url(current_host, web2_url=config["icinga.web2_url"]),
-                        len(service_list),
-                        plural(len(service_list))
+                    text = host_services_header_template.format(
+                        url=get_web2_slack_url(current_host, web2_url=web2_url),
+                        num_services=len(service_list),
+                        plural=plural(len(service_list))
                     )
 
                     response_objects.append(text)
@@ -145,26 +164,24 @@ def format_slack_response(config, object_type="Host", result_objects=None, comme
 
                 current_host = result_object.get("host_name")
 
-                service_text = "&gt;{state_emoji} {url}{additional_info}: {output}"
-
-                service_text = service_text.format(
-                    state_emoji=icinga_states.value(result_object.get("state"), object_type).icon,
-                    url=get_web2_slack_url(current_host, result_object.get("name"), web2_url=config["icinga.web2_url"]),
+                service_text = service_status_line_template.format(
+                    state_emoji=all_icinga_states.value(result_object.get("state"), object_type).icon,
+                    url=get_web2_slack_url(current_host, result_object.get("name"), web2_url=web2_url),
                     additional_info=append_to_title,
-                    output=f"{output}"
+                    output=output
                 )
 
                 service_list.append(service_text)
 
             num_results += 1
 
-            if config["icinga.max_returned_results"] != "":
-                if num_results >= int(config["icinga.max_returned_results"]):
-                    if object_type is "Service":
-                        text = "*%s* (%d service%s)" % (
-                            get_web2_slack_url(current_host, web2_url=config["icinga.web2_url"]),
-                            len(service_list),
-                            plural(len(service_list))
+            if max_returned_results is not None:
+                if num_results >= max_returned_results:
+                    if object_type == "Service":
+                        text = host_services_header_template.format(
+                            url=get_web2_slack_url(current_host, web2_url=web2_url),
+                            num_services=len(service_list),
+                            plural=plural(len(service_list))
                         )
 
                         response_objects.append(text)
@@ -177,19 +194,55 @@ def format_slack_response(config, object_type="Host", result_objects=None, comme
                     break
 
     # fill blocks with formatted response
-    block_text = ""
-    for response_object in response_objects:
+    add_text_list_to_blocks(response, response_objects)
 
-        if len(block_text) + len(response_object) + 2 > slack_max_block_text_length:
-            response.add_block(block_text)
-            block_text = ""
+    return response.blocks
 
-        block_text += "%s\n\n" % response_object
 
-    else:
-        response.add_block(block_text)
+def add_text_list_to_blocks(response, text_list=None):
+    """Add a list of texts to the blocks of a response
 
-    return response.blocks
+    The texts are separated by an empty line and will be
+    joined into as few blocks as possible without exceeding
+    'slack_max_block_text_length'.
+
+    Parameters
+    ----------
+    response : BotResponse
+        the response to add the blocks to
+    text_list : list
+        a list of strings to add to the response
+    """
+
+    block_parts = list()
+    block_length = 0
+    for text in text_list or list():
+
+        if block_length + len(text) + 2 > slack_max_block_text_length:
+            response.add_block("".join(block_parts))
+            block_parts = list()
+            block_length = 0
+
+        block_parts.append(f"{text}\n\n")
+        block_length += len(text) + 2
+
+    response.add_block("".join(block_parts))
+
+
+def add_stale_data_warning(response):
+    """Add a warning to a response which was compiled from cached data
+
+    Parameters
+    ----------
+    response : BotResponse
+        the response to add the warning to
+    """
+
+    # responses without blocks only display their text
+    if len(response.blocks) > 0:
+        response.add_block(stale_data_warning)
+    else:
+        response.text = "%s\n%s" % (response.text, stale_data_warning)
 
 
 def slack_error_response(header=None, fallback_text=None, error_message=None):
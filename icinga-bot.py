@@ -11,6 +11,7 @@ used to narrow down the returned status list.
 
 import logging
 import asyncio
+import functools
 import re
 import ssl as ssl_lib
 
@@ -18,7 +19,7 @@ import certifi
 import slack
 
 from i2_slack_modules.classes import BotResponse, SlackUsers, SlackUser
-from i2_slack_modules.icinga_connection import RequestResponse
+from i2_slack_modules.icinga_connection import RequestResponse, i2_object_cache
 from i2_slack_modules.common import (
     parse_command_line,
     parse_own_config,
@@ -52,12 +53,15 @@ default_config_file_path = "./icinga-bot.ini"
 #   internal vars
 #
 
-mention_regex = "^<@(|[WU].+?)>(.*)"
+mention_regex = re.compile(r"^<@(|[WU].+?)>(.*)")
 
 args = None
 config = None
 user_info = SlackUsers()
 
+# implemented commands don't change at runtime
+bot_commands = BotCommands()
+
 
 #################
 #
@@ -65,6 +69,28 @@ user_info = SlackUsers()
 #
 
 
+async def run_command_handler(command_handler, command_handler_args):
+    """run a command handler in a worker thread
+
+    Command handlers request data from Icinga2 synchronously. Running
+    them in a thread keeps the event loop free to receive other messages.
+
+    Parameters
+    ----------
+    command_handler : Callable
+        the command handler to run
+    command_handler_args : dict
+        keyword arguments passed to command handler
+
+    Returns
+    -------
+    BotResponse: response returned by command handler
+    """
+
+    return await asyncio.get_event_loop().run_in_executor(
+        None, functools.partial(command_handler, **command_handler_args))
+
+
 async def handle_command(slack_message, slack_user=None):
     """parse a Slack message and try to interpret commands
 
@@ -98,11 +124,10 @@ async def handle_command(slack_message, slack_user=None):
         slack_message = _command + ' ' +slack_message.replace('<', '').replace('>', '').split('|')[1]
 
     # strip any mention "strings" from beginning of message
-    matches = re.search(mention_regex, slack_message)
+    matches = mention_regex.search(slack_message)
     if matches:
         slack_message = matches.group(2).strip()
 
-    bot_commands = BotCommands()
     called_command = bot_commands.get_command_called(slack_message)
 
     """
@@ -117,25 +142,28 @@ async def handle_command(slack_message, slack_user=None):
         "slack_user": slack_user
     }
 
+    # discard conversations the user abandoned a while ago
+    slack_user.reset_expired_conversation()
+
     # special case to reset conversation
     if called_command is not None and called_command.name == "reset":
-        response = called_command.get_command_handler()(**command_handler_args)
+        response = await run_command_handler(called_command.get_command_handler(), command_handler_args)
 
     # continue with conversion if there is one ongoing
     if response is None and slack_user.conversation is not None:
         this_command_handler = slack_user.conversation.command.get_command_handler()
         # try to chat with user
-        response = this_command_handler(**command_handler_args)
+        response = await run_command_handler(this_command_handler, command_handler_args)
 
     # any regular command which is not reset
     if response is None and called_command is not None and called_command.name != "reset":
 
-        logging.debug("Received '%s' command" % called_command.name)
+        logging.debug("Received '%s' command", called_command.name)
 
         command_handler = called_command.get_command_handler()
 
         if command_handler:
-            response = command_handler(**command_handler_args)
+            response = await run_command_handler(command_handler, command_handler_args)
         else:
             logging.error("command_handler for command '%s' not defined in command_definition.py" %
                           called_command.name)
@@ -165,46 +193,52 @@ async def message(**payload):
     """
 
     data = payload["data"]
+
+    # don't answer if message was sent by a bot, this includes all messages sent by this bot
+    if data.get("bot_id") is not None:
+        return
+
+    # nothing to parse, i.e. message was deleted or is empty
+    if not data.get("text"):
+        return
+
     web_client = payload["web_client"]
+    channel_id = data.get("channel")
 
-    if data.get("text") is not None:
-        channel_id = data.get("channel")
-        bot_id = data.get("bot_id")
+    logging.debug("Received new Slack message: %s", data.get("text"))
 
-        # don't answer if message was sent by a bot
-        if bot_id is not None:
-            return
+    # noinspection PyTypeChecker
+    user_info.set_web_handle(web_client)
 
-        logging.debug("Received new Slack message: %s" % data.get("text"))
+    slack_user = user_info.get(data.get("user"))
 
-        # noinspection PyTypeChecker
-        user_info.set_web_handle(web_client)
+    async with slack_user.message_lock:
 
         # parse command
-        response = await handle_command(data.get("text"), user_info.get(data.get("user")))
+        response = await handle_command(data.get("text"), slack_user)
 
-        slack_api_response = post_slack_message(web_client, channel_id, response)
+        slack_api_response = await post_slack_message(web_client, channel_id, response)
 
         if slack_api_response.error:
             error_message = slack_error_response(
                 header="Slack API error while posting to Slack",
                 error_message=slack_api_response.error)
 
-            post_slack_message(web_client, channel_id, error_message)
+            await post_slack_message(web_client, channel_id, error_message)
 
-        await user_info.fetch_slack_user_info(data.get("user"))
+    await user_info.fetch_slack_user_info(data.get("user"))
 
     return
 
 
-def post_slack_message(handle=None, channel=None, slack_response=None):
+async def post_slack_message(handle=None, channel=None, slack_response=None):
     """
     Post a message to Slack
 
     Parameters
     ----------
     handle: object
-        the Slack client handle to use
+        the async Slack client handle to use
     channel: str
         Slack channel to post message to
     slack_response: BotResponse
@@ -215,16 +249,16 @@ def post_slack_message(handle=None, channel=None, slack_response=None):
     RequestResponse: slack response from posting a message
     """
 
-    def __do_post(text, blocks, attachments):
+    async def __do_post(text, blocks, attachments):
 
         this_response = RequestResponse()
 
         # try to send of message
         try:
-            logging.debug("Posting Slack message to channel '%s'" % channel)
+            logging.debug("Posting Slack message to channel '%s'", channel)
 
             # noinspection PyUnresolvedReferences
-            this_response.text = handle.chat_postMessage(
+            this_response.text = await handle.chat_postMessage(
                 channel=channel,
                 text=text[:slack_max_message_text_length],
                 blocks=blocks,
@@ -257,8 +291,8 @@ def post_slack_message(handle=None, channel=None, slack_response=None):
 
         splitted_blocks = split_blocks(slack_response.blocks)
 
-        logging.debug("Sending multiple Slack messages as the number of blocks %d exceeds the maximum of %d" %
-                      (len(slack_response.blocks), slack_max_message_blocks))
+        logging.debug("Sending multiple Slack messages as the number of blocks %d exceeds the maximum of %d",
+                      len(slack_response.blocks), slack_max_message_blocks)
 
         post_iteration = 1
         for message_blocks in splitted_blocks:
@@ -269,7 +303,7 @@ def post_slack_message(handle=None, channel=None, slack_response=None):
             if post_iteration == len(splitted_blocks):
                 last_message_attachments = slack_response.dump_attachments()
 
-            response = __do_post(slack_response.text, message_blocks, last_message_attachments)
+            response = await __do_post(slack_response.text, message_blocks, last_message_attachments)
 
             if response.error:
                 break
@@ -278,7 +312,7 @@ def post_slack_message(handle=None, channel=None, slack_response=None):
 
     else:
 
-        response = __do_post(slack_response.text, slack_response.blocks, slack_response.dump_attachments())
+        response = await __do_post(slack_response.text, slack_response.blocks, slack_response.dump_attachments())
         """
         if isinstance(slack_response, BotResponse):
         else:
@@ -288,7 +322,7 @@ def post_slack_message(handle=None, channel=None, slack_response=None):
         """
 
     if response.error:
-        logging.error("Posting Slack message to channel '%s' failed: " % response.error)
+        logging.error("Posting Slack message to channel '%s' failed: %s", channel, response.error)
 
     # only the response of the last message will be returned
     return response
@@ -326,17 +360,37 @@ if __name__ == "__main__":
     config["bot.license"] = __license__
     config["bot.url"] = __url__
 
+    ################
+    #   apply Icinga2 object cache timeout
+    if config["icinga.cache_timeout"] != "":
+        try:
+            cache_timeout = int(config["icinga.cache_timeout"])
+        except ValueError:
+            cache_timeout = -1
+
+        # entries older than stale_timeout are removed from cache
+        if not 0 <= cache_timeout <= i2_object_cache.stale_timeout:
+            do_error_exit("Config: option 'icinga.cache_timeout' needs to be a number of seconds "
+                          "between 0 and %d" % i2_object_cache.stale_timeout)
+
+        i2_object_cache.timeout = cache_timeout
+
     # set up slack ssl context
     slack_ssl_context = ssl_lib.create_default_context(cafile=certifi.where())
 
     # get command handler and call it to get startup message
-    icinga_status_command = BotCommands().get_command_called("icinga status").get_command_handler()
+    icinga_status_command = bot_commands.get_command_called("icinga status").get_command_handler()
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
 
     # message about start
-    client = slack.WebClient(token=config["slack.bot_token"], ssl=slack_ssl_context)
+    client = slack.WebClient(token=config["slack.bot_token"], ssl=slack_ssl_context, run_async=True, loop=loop)
 
-    post_response = post_slack_message(client, config["slack.default_channel"],
-                                       icinga_status_command(config=config, startup=True))
+    post_response = loop.run_until_complete(
+        post_slack_message(client, config["slack.default_channel"],
+                           icinga_status_command(config=config, startup=True))
+    )
 
     del client
 
@@ -344,8 +398,6 @@ if __name__ == "__main__":
         do_error_exit("Error while posting startup message to slack (%s): %s" %
                       (config["slack.default_channel"], post_response.error))
 
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
     rtm_client = slack.RTMClient(
         token=config["slack.bot_token"], ssl=slack_ssl_context, run_async=True, loop=loop
     )